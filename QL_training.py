@@ -1,43 +1,42 @@
 """Calculate rating."""
 
+import argparse
 import cProfile
+from concurrent.futures import ThreadPoolExecutor
 from itertools import combinations
-import pickle
-from tqdm import tqdm
-
-import matplotlib.pyplot as plt
-import numpy as np
 
 from bitboard import OthelloGame
 from matching import TrueSkill
 from strategy import Strategy
-
-
-def set_match(strategy1, strategy2, color):
-    global Q_values
-
-    game = OthelloGame(color)
-    game.load_strategy(Strategy)
-    if strategy1 == "QLearning":
-        game.change_strategy(strategy1, is_player=True, Q_values=Q_values)
-    else:
-        game.change_strategy(strategy1, is_player=True)
-    if strategy2 == "QLearning":
-        game.change_strategy(strategy2, is_player=False, Q_values=Q_values)
+from strategy.qlearning import _DICT_DIR, dump_q_values, load_q_values
+
+Q_PATH = _DICT_DIR / "my_dict-0.5-0.9-0.1.npz"
+
+
+# Games reused between matches, keyed by (strategy1, strategy2, color).
+_GAMES = {}
+
+
+def _pooled_game(strategy1, strategy2, color):
+    """Return a game with the given strategies which is ready to be played."""
+    key = (strategy1, strategy2, color)
+    if key not in _GAMES:
+        game = OthelloGame(color)
+        game.load_strategy(Strategy)
+        if strategy1 == "QLearning":
+            game.change_strategy(strategy1, is_player=True, Q_values=Q_values)
+        else:
+            game.change_strategy(strategy1, is_player=True)
+        if strategy2 == "QLearning":
+            game.change_strategy(strategy2, is_player=False, Q_values=Q_values)
+        else:
+            game.change_strategy(strategy2, is_player=False)
+        game.auto_mode(True)
+        _GAMES[key] = game
     else:
-        game.change_strategy(strategy2, is_player=False)
-    game.auto_mode(True)
-    while True:
-        fin, _ = game.process_game()
-        if fin:
-            break
-
-    if strategy1 == "QLearning":
-        Q_values = game._strategy_player._strategy.return_dict()
-    else:
-        Q_values = game._strategy_opponent._strategy.return_dict()
-
-    return game.result
+        game = _GAMES[key]
+        game.reset_board()
+    return game
 
 
 def matching(strategies):
@@ -64,26 +63,26 @@ def matching(strategies):
     lose = 0
     drew = 0
 
-    rslt = set_match(strategy1, strategy2, "black")
-    if rslt == "WIN":
-        win += 1
-    if rslt == "LOSE":
-        lose += 1
-    if rslt == "DRAW":
-        drew += 1
-
-    rslt = set_match(strategy1, strategy2, "white")
-    if rslt == "WIN":
-        win += 1
-    if rslt == "LOSE":
-        lose += 1
-    if rslt == "DRAW":
-        drew += 1
+    for color in ["black", "white"]:
+        game = _pooled_game(strategy1, strategy2, color)
+        while True:
+            fin, _ = game.process_game()
+            if fin:
+                break
+
+        if game.result == "WIN":
+            win += 1
+        elif game.result == "LOSE":
+            lose += 1
+        elif game.result == "DRAW":
+            drew += 1
 
     return strategy1, strategy2, win, lose, drew
 
 
 def printer(Rating: TrueSkill):
+    import matplotlib.pyplot as plt
+
     keys, mus, sigmas = Rating.returner()
 
     plt.bar(list(range(len(mus))), mus, yerr=sigmas)
@@ -91,7 +90,7 @@ def printer(Rating: TrueSkill):
     plt.xticks(list(range(len(mus))), keys)
 
 
-def runby1():
+def runby1(fast_io=False):
     repeat = 100000
     STRAT = [
         "random",
@@ -100,6 +99,8 @@ def runby1():
 
     Rating = TrueSkill(STRAT, filename="./matching/trueskill4QL.pkl")
 
+    from tqdm import tqdm
+
     parameters = []
     for _ in range(repeat):
         for strategy1, strategy2 in combinations(STRAT, 2):
@@ -107,41 +108,53 @@ def runby1():
     progress_bar = tqdm(total=len(parameters))
 
     global Q_values
-    try:
-        with open(".//strategy//QL_dict//my_dict-0.5-0.9-0.1.pickle", "rb") as f:
-            Q_values = pickle.load(f)
-    except:
-        Q_values = {}
-
-    for i, parameter in enumerate(parameters):
-        rslt = matching(parameter)
-        # Update Rating.
-        strategy1, strategy2, win, lose, drew = rslt
-        for _ in range(win):
-            Rating.update_rating(strategy1, strategy2)
-        for _ in range(lose):
-            Rating.update_rating(strategy2, strategy1)
-        for _ in range(drew):
-            Rating.update_rating(strategy1, strategy2, True)
-        progress_bar.update(1)
-
-        # It takes long time for proccessing.
-        if i % 5000 == 0:
-            with open("./strategy/QL_dict/averageQ.txt", "a") as log:
-                length = "{:>15}".format(len(Q_values.values()))
-                ave = str(np.average(np.array(
-                    [value for value in Q_values.values()])))
-                log.write(length + ", " + ave + "\n")
+    Q_values = load_q_values(Q_PATH, fast_io)
+
+    with ThreadPoolExecutor(max_workers=1) as saver:
+        saving = None
+        buffered = []
+        for cnt, parameter in enumerate(parameters, 1):
+            buffered.append(matching(parameter))
+            if len(buffered) < 256 and cnt % 5000:
+                continue
+            # Update Rating.
+            Rating.update_rating_results(buffered)
+            progress_bar.update(len(buffered))
+            buffered.clear()
+
+            # It takes long time for proccessing.
+            if cnt % 5000 == 0:
+                with open(_DICT_DIR / "averageQ.txt", "a") as log:
+                    length = "{:>15}".format(len(Q_values))
+                    ave = str(Q_values.mean())
+                    log.write(length + ", " + ave + "\n")
+                # Save a checkpoint, writing Q values in the background.
+                # Errors of the previous one are raised here.  The last
+                # match is covered by the final dump below.
+                Rating.save_rating()
+                if saving is not None:
+                    saving.result()
+                if cnt < len(parameters):
+                    saving = saver.submit(
+                        dump_q_values, Q_values.copy(), Q_PATH, fast_io)
+        Rating.update_rating_results(buffered)
+        progress_bar.update(len(buffered))
+        if saving is not None:
+            saving.result()
 
     Rating.save_rating()
     progress_bar.close()
     Rating.printer()
 
-    with open(".//strategy//QL_dict//my_dict-0.5-0.9-0.1.pickle", "wb") as f:
-        pickle.dump(Q_values, f)
+    dump_q_values(Q_values, Q_PATH, fast_io)
     print("Game was played", len(parameters)*2, "times.")
 
 
 if __name__ == "__main__":
-    runby1()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--fast-io", action="store_true",
+        help="store Q values with msgpack + zstd instead of .npz")
+    args = parser.parse_args()
+    runby1(fast_io=args.fast_io)
     # cProfile.run("runby1()", filename="./matching/matching.prof", sort=2)
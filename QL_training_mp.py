@@ -1,17 +1,132 @@
 """Calculate rating."""
 
-from concurrent.futures import ProcessPoolExecutor
-from itertools import combinations
+import argparse
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait)
+from itertools import combinations, islice
 import multiprocessing
-import pickle
-from tqdm import tqdm
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from bitboard import OthelloGame
 from matching import TrueSkill
 from strategy import Strategy
+from strategy.qlearning import _DICT_DIR, dump_q_values, load_q_values
+from strategy.qtable import QTable
+
+Q_PATH = _DICT_DIR / "my_dict-0.5-0.9-0.1.npz"
+
+# Q values of the parent process, which forked workers inherit by
+# copy-on-write.
+_SHARED_Q = None
+# Q values of the worker process, set by ``_init_worker``.
+_Q = None
+# Games reused between matches, keyed by (strategy1, strategy2, color).
+_GAMES = {}
+# Rough upper bound of the Q values written in a match of two games.
+_INSERTS_PER_MATCH = 64
+
+
+class _DeltaTable(QTable):
+    """Q table which remembers the entries written since the last ``pop_delta``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._delta_states = []
+        self._delta_actions = []
+        self._delta_values = []
+
+    @classmethod
+    def wrap(cls, table):
+        """Return a table which updates the arrays of ``table`` in place."""
+        wrapped = cls.__new__(cls)
+        vars(wrapped).update(vars(table))
+        wrapped._delta_states = []
+        wrapped._delta_actions = []
+        wrapped._delta_values = []
+        return wrapped
+
+    def set(self, state, action, value):
+        QTable.set(self, state, action, value)
+        self._record(state, action, value)
+
+    def td_update(self, state, action, *args):
+        value = QTable.td_update(self, state, action, *args)
+        self._record(state, action, value)
+        return value
+
+    def _record(self, state, action, value):
+        # Parallel lists instead of a dict keyed by (state, action).
+        self._delta_states.append(state)
+        self._delta_actions.append(action)
+        self._delta_values.append(value)
+
+    def pop_delta(self):
+        """Return the written states, actions and values and start a new record."""
+        delta = (
+            np.array(self._delta_states, dtype=np.uint64),
+            np.array(self._delta_actions, dtype=np.int8),
+            np.array(self._delta_values, dtype=np.float32))
+        self._delta_states.clear()
+        self._delta_actions.clear()
+        self._delta_values.clear()
+        return delta
+
+
+def _init_worker(Q_values=None):
+    """
+    Store the Q values of the worker.
+
+    Forked workers pass nothing and wrap the inherited table.  Its pages
+    are copied when the worker first writes to them; the writes hit random
+    slots, so a busy worker copies more and more of the table.  The parent
+    reserves room in ``_executor`` so that no worker resizes into a private
+    table of twice the size.
+    """
+    global _Q
+    if Q_values is None:
+        Q_values = _SHARED_Q
+    _Q = _DeltaTable.wrap(Q_values)
+
+
+def _executor(Q_values, max_workers, inserts=0):
+    """
+    Return a process pool whose workers share ``Q_values``.
+
+    Room for ``inserts`` new Q values is made before the workers start.
+    """
+    global _SHARED_Q
+    Q_values.reserve(inserts)
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Only a reference, the parent keeps a single table.
+        _SHARED_Q = Q_values
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker)
+    return ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(Q_values,))
+
+
+def _pooled_game(strategy1, strategy2, color):
+    """Return a game of this worker which is ready to be played."""
+    key = (strategy1, strategy2, color)
+    if key not in _GAMES:
+        game = OthelloGame(color)
+        game.load_strategy(Strategy)
+        if strategy1 == "QLearning":
+            game.change_strategy(strategy1, is_player=True, Q_values=_Q)
+        else:
+            game.change_strategy(strategy1, is_player=True)
+        if strategy2 == "QLearning":
+            game.change_strategy(strategy2, is_player=False, Q_values=_Q)
+        else:
+            game.change_strategy(strategy2, is_player=False)
+        game.auto_mode(True)
+        _GAMES[key] = game
+    else:
+        game = _GAMES[key]
+        game.reset_board()
+    return game
 
 
 def matching(strategies):
@@ -29,8 +144,11 @@ def matching(strategies):
     ----------
     count_win, count_lose, count_draw : list
         result of matches.
+
+    delta : tuple of np.ndarray
+        States, actions and Q values written during the matches.
     """
-    (strategy1, strategy2, Q_values) = strategies
+    (strategy1, strategy2) = strategies
     if strategy1 == strategy2:
         return
 
@@ -39,28 +157,12 @@ def matching(strategies):
     drew = 0
 
     for color in ["black", "white"]:
-        game = OthelloGame(color)
-        game.load_strategy(Strategy)
-        if strategy1 == "QLearning":
-            game.change_strategy(strategy1, is_player=True, Q_values=Q_values)
-        else:
-            game.change_strategy(strategy1, is_player=True)
-        if strategy2 == "QLearning":
-            game.change_strategy(strategy2, is_player=False, Q_values=Q_values)
-        else:
-            game.change_strategy(strategy2, is_player=False)
-        game.auto_mode(True)
-
+        game = _pooled_game(strategy1, strategy2, color)
         while True:
             fin, _ = game.process_game()
             if fin:
                 break
 
-        if strategy1 == "QLearning":
-            Q_values = game._strategy_player._strategy.return_dict()
-        else:
-            Q_values = game._strategy_opponent._strategy.return_dict()
-
         if game.result == "WIN":
             win += 1
         elif game.result == "LOSE":
@@ -68,19 +170,65 @@ def matching(strategies):
         elif game.result == "DRAW":
             drew += 1
 
-    return strategy1, strategy2, win, lose, drew
+    return strategy1, strategy2, win, lose, drew, _Q.pop_delta()
+
 
+def _matching_chunk(chunk):
+    """Play the matches of several parameters in one task."""
+    return [matching(strategies) for strategies in chunk]
+
+
+def _bounded_map(executor, parameters, chunksize, max_pending):
+    """
+    Yield the results of ``matching`` in the order they complete.
+
+    Parameters are submitted in chunks, and at most ``max_pending`` chunks
+    are in flight, so that tasks and results waiting in memory stay bounded.
+    """
+    parameters = iter(parameters)
+    pending = set()
+    while True:
+        chunk = list(islice(parameters, chunksize))
+        if chunk:
+            pending.add(executor.submit(_matching_chunk, chunk))
+            if len(pending) < max_pending:
+                continue
+        if not pending:
+            return
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield from future.result()
+
+
+def printer(Rating: TrueSkill, bars=None):
+    """Draw the ratings, or update ``bars`` drawn by the previous call.
+
+    Returns
+    ----------
+    bars : matplotlib.container.BarContainer
+        Bars to be passed to the next call.
+    """
+    import matplotlib.pyplot as plt
 
-def printer(Rating: TrueSkill):
     keys, mus, sigmas = Rating.returner()
 
-    plt.bar(list(range(len(mus))), mus, yerr=sigmas)
+    if bars is None:
+        bars = plt.bar(list(range(len(mus))), mus, yerr=sigmas)
+        plt.xticks(list(range(len(mus))), keys)
+    else:
+        for bar, mu in zip(bars, mus):
+            bar.set_height(mu)
+        # Vertical lines of the error bars.
+        bars.errorbar.lines[2][0].set_segments([
+            [(x, mu - sigma), (x, mu + sigma)]
+            for x, (mu, sigma) in enumerate(zip(mus, sigmas))])
     plt.ylim([min(mus)-5, max(mus)+5])
-    plt.xticks(list(range(len(mus))), keys)
+    return bars
 
 
-def runMP(plot=False, Q_values=None):
+def runMP(plot=False, Q_values=None, fast_io=False):
     repeat = 10000
+    max_workers = 8
     STRAT = [
         "random",
         "QLearning",
@@ -88,59 +236,77 @@ def runMP(plot=False, Q_values=None):
 
     Rating = TrueSkill(STRAT, filename="./matching/trueskill4QL.pkl")
 
-    try:
-        with open(".//strategy//QL_dict//my_dict-0.5-0.9-0.1.pickle", "rb") as f:
-            Q_values = pickle.load(f)
-    except:
-        Q_values = {}
+    Q_values = load_q_values(Q_PATH, fast_io)
 
+    # Imported here so that workers do not load them.
+    from tqdm import tqdm
     if plot:
-        cnt = 0
+        import matplotlib.pyplot as plt
+
         fig = plt.figure()
+        plt.show(block=False)
+        bars = None
 
-    with multiprocessing.Manager() as manager:
-        Q_values_ = manager.dict(Q_values)
+    pairs = list(combinations(STRAT, 2))
+    total = repeat * len(pairs)
 
-        parameters = []
+    def parameters():
         for _ in range(repeat):
-            for strategy1, strategy2 in combinations(STRAT, 2):
-                parameters.append((strategy1, strategy2, Q_values_))
-        progress_bar = tqdm(total=len(parameters))
-
-        with ProcessPoolExecutor(max_workers=8) as executor:
-            for rslt in executor.map(matching, parameters):
-                # Update Rating.
-                strategy1, strategy2, win, lose, drew = rslt
-                for _ in range(win):
-                    Rating.update_rating(strategy1, strategy2)
-                for _ in range(lose):
-                    Rating.update_rating(strategy2, strategy1)
-                for _ in range(drew):
-                    Rating.update_rating(strategy1, strategy2, True)
-
-                progress_bar.update(1)
-                if plot:
-                    cnt += 1
-                    if cnt < 5000:
-                        continue
-                    cnt = 0
-                    plt.cla()
-                    printer(Rating)
-                    plt.pause(.01)
-
-                    with open("./strategy/QL_dict/averageQ.txt", "a") as log:
-                        log.write(
-                            str(np.average(np.array(
-                            [value for value in Q_values.values()]
-                            ))) + "\n")
-
-        Rating.save_rating()
-        progress_bar.close()
-        Rating.printer()
-        with open(".//strategy//QL_dict//my_dict-0.5-0.9-0.1.pickle", "wb") as f:
-            pickle.dump(Q_values_, f)
-        print("Game was played", len(parameters)*2, "times.")
+            yield from pairs
+
+    progress_bar = tqdm(total=total)
+
+    with ThreadPoolExecutor(max_workers=1) as saver, \
+            _executor(Q_values, max_workers, total*_INSERTS_PER_MATCH) as executor:
+        results = _bounded_map(
+            executor, parameters(), chunksize=64, max_pending=4*max_workers)
+        saving = None
+        buffered = []
+        for cnt, rslt in enumerate(results, 1):
+            *result, delta = rslt
+            Q_values.set_many(*delta)
+            buffered.append(result)
+            if len(buffered) < 256 and cnt % 5000:
+                continue
+            # Update Rating.
+            Rating.update_rating_results(buffered)
+            progress_bar.update(len(buffered))
+            buffered.clear()
+
+            if cnt % 5000:
+                continue
+            # Save a checkpoint, writing Q values in the background.
+            # Errors of the previous one are raised here.  The last
+            # match is covered by the final dump below.
+            Rating.save_rating()
+            if saving is not None:
+                saving.result()
+            if cnt < total:
+                saving = saver.submit(
+                    dump_q_values, Q_values.copy(), Q_PATH, fast_io)
+            if plot:
+                bars = printer(Rating, bars)
+                fig.canvas.draw_idle()
+                fig.canvas.flush_events()
+
+                with open(_DICT_DIR / "averageQ.txt", "a") as log:
+                    log.write(str(Q_values.mean()) + "\n")
+        Rating.update_rating_results(buffered)
+        progress_bar.update(len(buffered))
+        if saving is not None:
+            saving.result()
+
+    Rating.save_rating()
+    progress_bar.close()
+    Rating.printer()
+    dump_q_values(Q_values, Q_PATH, fast_io)
+    print("Game was played", total*2, "times.")
 
 
 if __name__ == "__main__":
-    runMP(plot=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--fast-io", action="store_true",
+        help="store Q values with msgpack + zstd instead of .npz")
+    args = parser.parse_args()
+    runMP(plot=True, fast_io=args.fast_io)
@@ -1,3 +1,10 @@
 from .bitothello import OthelloGameC as OthelloGame
 
+# Builds of an older bitOthello.pyx lack the methods the strategies use.
+if not all(
+        hasattr(OthelloGame, name) for name in ("reset_board", "score_and_legal")):
+    raise ImportError(
+        "bitboard.bitothello was built from an older bitOthello.pyx. "
+        "Rebuild it and strategy.minmaxcalc as described in README.md.")
+
 __all__ = ["OthelloGame"]
@@ -1,4 +1,4 @@
-/* Generated by Cython 0.29.33 */
+/* Generated by Cython 3.3.0 */
 
 #ifndef __PYX_HAVE__bitboard__bitothello
 #define __PYX_HAVE__bitboard__bitothello
@@ -12,7 +12,7 @@ struct OthelloGameCObject;
  * cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType]:             # <<<<<<<<<<<<<<
  * 
  *     # Class variables.
- */
+*/
 struct OthelloGameCObject {
   PyObject_HEAD
   struct __pyx_vtabstruct_8bitboard_10bitothello_OthelloGameC *__pyx_vtab;
@@ -39,12 +39,17 @@ struct OthelloGameCObject {
 
 #ifndef __PYX_HAVE_API__bitboard__bitothello
 
-#ifndef __PYX_EXTERN_C
-  #ifdef __cplusplus
-    #define __PYX_EXTERN_C extern "C"
-  #else
-    #define __PYX_EXTERN_C extern
-  #endif
+#ifdef CYTHON_EXTERN_C
+    #undef __PYX_EXTERN_C
+    #define __PYX_EXTERN_C CYTHON_EXTERN_C
+#elif defined(__PYX_EXTERN_C)
+    #ifdef _MSC_VER
+    #pragma message ("Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.")
+    #else
+    #warning Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.
+    #endif
+#else
+    #define __PYX_EXTERN_C extern "C++"
 #endif
 
 #ifndef DL_IMPORT
@@ -58,10 +63,21 @@ __PYX_EXTERN_C DL_IMPORT(PyTypeObject) OthelloGameCType;
 /* WARNING: the interface of the module init function changed in CPython 3.5. */
 /* It now returns a PyModuleDef instance instead of a PyModule instance. */
 
-#if PY_MAJOR_VERSION < 3
-PyMODINIT_FUNC initbitothello(void);
-#else
+/* WARNING: Use PyImport_AppendInittab("bitothello", PyInit_bitothello) instead of calling PyInit_bitothello directly from Python 3.5 */
 PyMODINIT_FUNC PyInit_bitothello(void);
+
+#if PY_VERSION_HEX >= 0x03050000 && (defined(__GNUC__) || defined(__clang__) || defined(_MSC_VER) || (defined(__cplusplus) && __cplusplus >= 201402L))
+#if defined(__cplusplus) && __cplusplus >= 201402L
+[[deprecated("Use PyImport_AppendInittab(\"bitothello\", PyInit_bitothello) instead of calling PyInit_bitothello directly.")]] inline
+#elif defined(__GNUC__) || defined(__clang__)
+__attribute__ ((__deprecated__("Use PyImport_AppendInittab(\"bitothello\", PyInit_bitothello) instead of calling PyInit_bitothello directly."), __unused__)) __inline__
+#elif defined(_MSC_VER)
+__declspec(deprecated("Use PyImport_AppendInittab(\"bitothello\", PyInit_bitothello) instead of calling PyInit_bitothello directly.")) __inline
+#endif
+static PyObject* __PYX_WARN_IF_PyInit_bitothello_INIT_CALLED(PyObject* res) {
+  return res;
+}
+#define PyInit_bitothello() __PYX_WARN_IF_PyInit_bitothello_INIT_CALLED(PyInit_bitothello())
 #endif
 
 #endif /* !__PYX_HAVE__bitboard__bitothello */
@@ -12,6 +12,26 @@ import random
 logger = getLogger(__name__)
 
 
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    #define othello_popcount(x) ((int)__popcnt64(x))
+    static inline int othello_ctz(unsigned long long x) {
+        unsigned long index;
+        _BitScanForward64(&index, x);
+        return (int)index;
+    }
+    #else
+    #define othello_popcount(x) __builtin_popcountll(x)
+    #define othello_ctz(x) __builtin_ctzll(x)
+    #endif
+    """
+    int othello_popcount(uint64_t x) nogil
+    # Index of the lowest set bit, which must exist.
+    int othello_ctz(uint64_t x) nogil
+
+
 cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType]:
 
     def __cinit__(self):
@@ -88,10 +108,6 @@ cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType
         >>> game = OthelloBoard(player_clr="white")
         >>> game.play()
         """
-        # Set a board.
-        self._black_board = 0x0000000810000000ULL
-        self._white_board = 0x0000001008000000ULL
-
         # Black or white.
         if player_clr == "black":
             self._player_clr = self.BLACK
@@ -102,6 +118,22 @@ cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType
         else:
             raise KeyError
 
+        # Mode.
+        self._player_auto = False
+
+        self.reset_board()
+
+    cpdef void reset_board(self):
+        """
+        Start a new game on this instance.
+
+        The color of the player, the automatic mode and the loaded strategies
+        are kept, so that the same instance can be reused for many games.
+        """
+        # Set a board.
+        self._black_board = self.INIT_BLACK
+        self._white_board = self.INIT_WHITE
+
         # States of game.
         self.turn = 0
         self.reversible = 0
@@ -111,9 +143,6 @@ cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType
         self._count_player = 2
         self._count_opponent = 2
         self._pass_cnt = [0, 0]  # [white, black]
-
-        # Mode.
-        self._player_auto = False
         logger.info("Game starts.")
 
         # Logger.
@@ -397,15 +426,41 @@ cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType
         reversible |= blank_board & (one_rv >> 7)
         return reversible
 
+    cpdef (int, int, uint64_t, uint64_t) score_and_legal(
+            self, uint64_t player_board, uint64_t opponent_board):
+        """
+        Count the disks and find the legal moves of both players at once.
+
+        Parameters
+        ----------
+        player_board, opponent_board : uint64_t
+            The bitboards of the two players.
+
+        Returns
+        -------
+        Tuple[int, int, uint64_t, uint64_t]
+            The numbers of disks of the players and their reversible areas.
+        """
+        cdef int count_player = othello_popcount(player_board)
+        cdef int count_opponent = othello_popcount(opponent_board)
+        # A full board has no moves, so the scans are skipped.
+        if count_player + count_opponent == 64:
+            return count_player, count_opponent, 0, 0
+        return (
+            count_player, count_opponent,
+            self.reversible_area(0, player_board, opponent_board),
+            self.reversible_area(0, opponent_board, player_board),
+            )
+
     cpdef list reversible_area_list(
             self, unsigned char turn, uint64_t black_board = 0, uint64_t white_board = 0):
         cdef uint64_t reversible = self.reversible_area(turn, black_board, white_board)
 
-        cdef int num
+        # Visit only the set bits, from the lowest one.
         cdef list candidates = []
-        for num in range(64):
-            if (reversible & self._EXP2[num]):
-                candidates.append(num)
+        while reversible:
+            candidates.append(othello_ctz(reversible))
+            reversible &= reversible - 1
         return candidates
 
     cpdef bint is_reversible(
@@ -663,7 +718,7 @@ cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType
 
         if self.turn == self._player_clr:
             self.reversible = self.reversible_area(self.turn)
-            if self.turn_playable(self.turn):
+            if self.reversible:
                 if self._player_auto:
                     logger.debug("Player's turn was processed automatically.")
                     self.play_turn(self._strategy_player.selecter(self))
@@ -676,7 +731,7 @@ cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType
                 self._pass_cnt[self.turn] += 1
         else:
             self.reversible = self.reversible_area(self.turn)
-            if self.turn_playable(self.turn):
+            if self.reversible:
                 logger.debug("CPU's turn was processed automatically.")
                 self.play_turn(self._strategy_opponent.selecter(self))
                 return False, True
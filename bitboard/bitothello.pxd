@@ -66,3 +66,9 @@ cdef public class OthelloGameC [object OthelloGameCObject, type OthelloGameCType
     cpdef void load_state(
         self, uint64_t black_board, uint64_t white_board,
         list board_log, list board_back)
+
+    # New methods are appended so that the vtable layout seen by modules
+    # which cimport this class, such as strategy.minmaxcalc, is kept.
+    cpdef void reset_board(self)
+    cpdef (int, int, uint64_t, uint64_t) score_and_legal(
+        self, uint64_t player_board, uint64_t opponent_board)
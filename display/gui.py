@@ -43,6 +43,7 @@ class MyFrame(wx.Frame):
     -------
     on_timer(event)
         The method that is called on every timer event.
+        It processes the game and redraws the panels.
     """
 
     def __init__(
@@ -86,6 +87,8 @@ class MyFrame(wx.Frame):
             The timer event.
         """
         self.result, self.update = self.othello.process_game()
+        self._game_panel.redraw()
+        self._user_panel.redraw()
         # time.sleep(0.5)
         # logger.debug("Frame update.")
 
@@ -98,18 +101,25 @@ class GamePanel(wx.Panel):
         _disks (List[List[Disk]]): 8x8 nested list to hold the disks.
         _position (List[List[Tuple[int, int]]]): 8x8 nested list to hold the positions of each square.
         _line_position (List[List[int]]): 2x9 nested list to hold the positions of each line.
+        _disk_tools (Dict[int, Tuple[wx.Pen, wx.Brush]]): Pen and brush for each value of the board.
+        _cached_size (Tuple[int, int]): Panel size the bitmaps were built for.
+        _static_bmp (wx.Bitmap): Board without disks, drawn once per size.
+        _prev_board (List[List[int]]): Board drawn on the buffer, or None to redraw everything.
+        _drawn_board (Tuple[int, int]): Bitboards of the last drawn board.
 
     Methods:
         __init__(self, frame):
             Constructs a GamePanel object and initializes its attributes.
         on_left_down(self, event):
             Handles the left mouse button down event.
+        on_paint(self, event):
+            Requests a full redraw when the panel was exposed.
         update_data(self):
             Updates the attributes that hold data to be drawn on the panel.
         draw_board(self):
-            Draws the board and disks on the panel.
-        on_timer(self, event):
-            Handles the timer event for the panel.
+            Draws the disks which changed since the last frame.
+        redraw(self):
+            Redraws the panel if the board or the size changed.
     """
 
     def __init__(self, frame):
@@ -133,12 +143,22 @@ class GamePanel(wx.Panel):
             for column in range(8):
                 self._disks[row][column] = Disk()
         self._square = SquareMap()
+        self._disk_tools = {
+            1: (wx.Pen(cp.CLR_BLACK_DISK), wx.Brush(cp.CLR_BLACK_DISK)),
+            -1: (wx.Pen(cp.CLR_WHITE_DISK), wx.Brush(cp.CLR_WHITE_DISK)),
+            0: (wx.Pen(cp.CLR_BOARD), wx.Brush(cp.CLR_BOARD)),
+        }
+
+        # Buffers which are kept between frames.
+        self._cached_size = None
+        self._static_bmp = None
+        self._bit_map = None
+        self._prev_board = None
+        self._drawn_board = None
 
         self._client_DC = wx.ClientDC(self)
-        self._timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_timer)
         self.Bind(wx.EVT_LEFT_DOWN, self.on_left_down)
-        self._timer.Start(100)
+        self.Bind(wx.EVT_PAINT, self.on_paint)
 
     def on_left_down(self, event):
         """If a disk area was clicked, return the position of disk.
@@ -159,12 +179,25 @@ class GamePanel(wx.Panel):
         else:
             self._frame.SetStatusText("Success.")
 
+    def on_paint(self, event):
+        """Redraw the whole board on the next tick after the panel was exposed.
+
+        Args:
+            event: The event object.
+        """
+        wx.PaintDC(self)
+        self._prev_board = None
+        self._drawn_board = None
+
     def update_data(self):
         """Get the size of panel and calculate the size of board."""
         width, height = self.GetSize()
+        self._board = self._frame.othello.display_board()
+        if (width, height) == self._cached_size:
+            return
+
         BOARD_SIZE = min(width, height)*0.7
         DISK_SIZE = (BOARD_SIZE/7)*0.7/2
-        self._board = self._frame.othello.display_board()
 
         self._width = width
         self._height = height
@@ -183,39 +216,52 @@ class GamePanel(wx.Panel):
             [height/2 + (x-4)*BOARD_SIZE/7 for x in range(9)]
         ]
 
+        # The board without disks only changes with the size of the panel.
+        self._static_bmp = wx.Bitmap(width, height)
+        static_DC = wx.MemoryDC(self._static_bmp)
+        static_DC.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        static_DC.Clear()
+        self._square.layout(self._line_position)
+        self._square.draw(static_DC)
+        static_DC.SelectObject(wx.NullBitmap)
+
+        self._bit_map = wx.Bitmap(width, height)
+        self._cached_size = (width, height)
+        self._prev_board = None
+
     def draw_board(self):
-        """Determine disks" position and draw area."""
-        self._bit_map = wx.Bitmap(self._width, self._height)
-        self._buffer_DC = wx.BufferedDC(self._client_DC, self._bit_map)
-        self._buffer_DC.Clear()
+        """Draw the disks which changed since the last frame."""
+        self._buffer_DC = wx.MemoryDC(self._bit_map)
+        if self._prev_board is None:
+            self._buffer_DC.DrawBitmap(self._static_bmp, 0, 0)
 
-        self._square.draw(self._buffer_DC, self._line_position)
         for row in range(8):
             for column in range(8):
-                if self._board[row][column] == 1:
-                    self._disks[row][column].draw(
-                        cp.CLR_BLACK_DISK,
-                        self._buffer_DC,
-                        self._position[row][column],
-                        self._DISK_SIZE,
-                        )
-                elif self._board[row][column] == -1:
-                    self._disks[row][column].draw(
-                        cp.CLR_WHITE_DISK,
-                        self._buffer_DC,
-                        self._position[row][column],
-                        self._DISK_SIZE,
-                        )
-                else:
-                    self._disks[row][column].draw(
-                        cp.CLR_BOARD,
-                        self._buffer_DC,
-                        self._position[row][column],
-                        self._DISK_SIZE,
-                        )
-        self._client_DC.DrawBitmap(self._bit_map, 0, 0)
-
-    def on_timer(self, event):
+                value = self._board[row][column]
+                if (self._prev_board is not None
+                        and self._prev_board[row][column] == value):
+                    continue
+                pen, brush = self._disk_tools[value]
+                self._disks[row][column].draw(
+                    pen, brush,
+                    self._buffer_DC,
+                    self._position[row][column],
+                    self._DISK_SIZE,
+                    )
+        self._prev_board = self._board
+        self._client_DC.Blit(
+            0, 0, self._width, self._height, self._buffer_DC, 0, 0)
+        self._buffer_DC.SelectObject(wx.NullBitmap)
+
+    def redraw(self):
+        """Redraw the panel if the board or the size changed."""
+        board = self._frame.othello.return_board()
+        # Compare the boards since user moves, undo and redo do not set
+        # the update flag of the frame.
+        if (board == self._drawn_board
+                and tuple(self.GetSize()) == self._cached_size):
+            return
+        self._drawn_board = board
         self.update_data()
         self.draw_board()
         # logger.debug("Panel update.")
@@ -239,12 +285,10 @@ class UserPanel(wx.Panel):
         A panel that displays the opponent's points.
     _result_panel : ResultPanel
         A panel that displays the game result.
-    _timer : wx.Timer
-        A timer used to update the panel.
 
     Methods
     -------
-    on_timer(event)
+    redraw()
         Updates the panel with the latest point and game result information.
     """
 
@@ -263,11 +307,7 @@ class UserPanel(wx.Panel):
         layout.Add(self._result_panel, proportion=1, flag=wx.EXPAND)
         self.SetSizer(layout)
 
-        self._timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_timer)
-        self._timer.Start(100)
-
-    def on_timer(self, event):
+    def redraw(self):
         """Determine disks' position and draw area."""
         [player, opponent] = self._frame.othello.update_count()
         self._user_point_panel.draw(player)
@@ -302,6 +342,16 @@ class PointPanel(wx.Panel):
             "You" for the user panel, "CPU" for the CPU panel.
         _client_DC : wx.ClientDC
             The device context for drawing on the panel.
+        _buffer_DC : wx.MemoryDC
+            The device context for drawing on the bitmap.
+        _bit_map : wx.Bitmap
+            A bitmap for double buffering, rebuilt when the size changes.
+        _font : wx.Font
+            The font of the text, rebuilt when the size changes.
+        _cached_size : tuple of int
+            The size of the panel the bitmap and the font were built for.
+        _disk_tools : dict
+            The pen and the brush for each disk color.
         """
         super().__init__()
         wx.Panel.__init__(self, panel)
@@ -313,6 +363,14 @@ class PointPanel(wx.Panel):
         else:
             self._text = "CPU"
         self._client_DC = wx.ClientDC(self)
+        self._buffer_DC = wx.MemoryDC()
+        self._bit_map = None
+        self._font = None
+        self._cached_size = None
+        self._disk_tools = {
+            color: (wx.Pen(color), wx.Brush(color))
+            for color in (cp.CLR_BLACK_DISK, cp.CLR_WHITE_DISK)
+        }
 
     def draw(self, point: int):
         """Show each player's points."""
@@ -323,25 +381,28 @@ class PointPanel(wx.Panel):
         else:
             color = cp.CLR_WHITE_DISK
 
-        self._bit_map = wx.Bitmap(width, height)
-        self._buffer_DC = wx.BufferedDC(self._client_DC, self._bit_map)
+        if (width, height) != self._cached_size:
+            self._bit_map = wx.Bitmap(width, height)
+            self._buffer_DC.SelectObject(self._bit_map)
+            self._font = wx.Font(
+                int(size*0.175),
+                wx.FONTFAMILY_DEFAULT,
+                wx.FONTSTYLE_NORMAL,
+                wx.FONTWEIGHT_NORMAL,
+                )
+            self._cached_size = (width, height)
         self._buffer_DC.Clear()
 
-        self._buffer_DC.SetPen(wx.Pen(color))
-        self._buffer_DC.SetBrush(wx.Brush(color))
+        pen, brush = self._disk_tools[color]
+        self._buffer_DC.SetPen(pen)
+        self._buffer_DC.SetBrush(brush)
         self._buffer_DC.DrawCircle(width/3, height/2, size*0.2)
 
-        self._buffer_DC.SetFont(
-            wx.Font(
-                size*0.175,
-                wx.FONTFAMILY_DEFAULT,
-                wx.FONTSTYLE_NORMAL,
-                wx.FONTWEIGHT_NORMAL,
-                ))
+        self._buffer_DC.SetFont(self._font)
         self._buffer_DC.DrawText("×" + str(point), width*0.55, height/2)
         self._buffer_DC.DrawText(self._text, width*0.55, height*0.3)
 
-        self._client_DC.DrawBitmap(self._bit_map, 0, 0)
+        self._client_DC.Blit(0, 0, width, height, self._buffer_DC, 0, 0)
 
 
 class ResultPanel(wx.Panel):
@@ -364,9 +425,13 @@ class ResultPanel(wx.Panel):
     _client_DC : wx.ClientDC
         A client device context for drawing on the panel.
     _bit_map : wx.Bitmap
-        A bitmap for double buffering.
-    _buffer_DC : wx.BufferedDC
-        A buffered device context for drawing on the bitmap.
+        A bitmap for double buffering, rebuilt when the size changes.
+    _buffer_DC : wx.MemoryDC
+        A device context for drawing on the bitmap.
+    _font : wx.Font
+        The font of the text, rebuilt when the size changes.
+    _cached_size : tuple of int
+        The size of the panel the bitmap and the font were built for.
 
     Methods
     -------
@@ -387,6 +452,12 @@ class ResultPanel(wx.Panel):
         self._frame = frame
         self._text = ""
         self._client_DC = wx.ClientDC(self)
+        self._buffer_DC = wx.MemoryDC()
+        self._bit_map = None
+        self._font = None
+        self._cached_size = None
+        self._pen = wx.Pen("black")
+        self._brush = wx.Brush("black")
 
     def draw(self):
         """
@@ -399,22 +470,24 @@ class ResultPanel(wx.Panel):
         else:
             self._text = ""
 
-        self._bit_map = wx.Bitmap(width, height)
-        self._buffer_DC = wx.BufferedDC(self._client_DC, self._bit_map)
-        self._buffer_DC.Clear()
-
-        self._buffer_DC.SetPen(wx.Pen("black"))
-        self._buffer_DC.SetBrush(wx.Brush("black"))
-        self._buffer_DC.SetFont(
-            wx.Font(
-                size*0.175,
+        if (width, height) != self._cached_size:
+            self._bit_map = wx.Bitmap(width, height)
+            self._buffer_DC.SelectObject(self._bit_map)
+            self._font = wx.Font(
+                int(size*0.175),
                 wx.FONTFAMILY_DEFAULT,
                 wx.FONTSTYLE_NORMAL,
                 wx.FONTWEIGHT_NORMAL
-                ))
+                )
+            self._cached_size = (width, height)
+        self._buffer_DC.Clear()
+
+        self._buffer_DC.SetPen(self._pen)
+        self._buffer_DC.SetBrush(self._brush)
+        self._buffer_DC.SetFont(self._font)
         self._buffer_DC.DrawText(self._text, width*0.5, height/2)
 
-        self._client_DC.DrawBitmap(self._bit_map, 0, 0)
+        self._client_DC.Blit(0, 0, width, height, self._buffer_DC, 0, 0)
 
 
 class Disk(object):
@@ -422,9 +495,9 @@ class Disk(object):
     def __init__(self):
         return
 
-    def draw(self, color: str, buffer_DC, position: tuple, size: float):
-        buffer_DC.SetPen(wx.Pen(color))
-        buffer_DC.SetBrush(wx.Brush(color))
+    def draw(self, pen, brush, buffer_DC, position: tuple, size: float):
+        buffer_DC.SetPen(pen)
+        buffer_DC.SetBrush(brush)
         buffer_DC.DrawCircle(position, size)
 
 
@@ -434,11 +507,18 @@ class SquareMap(object):
 
     Attributes:
     ----------
-    None
+    _edge_rects : list
+        Rectangles of the edge and of the surface of the board.
+    _line_segments : list
+        End points of the 18 lines of the board.
+    _dot_rects : list
+        Bounding rectangles of the 49 dots on the crossings.
 
     Methods:
     -------
-    draw(buffer_DC, line_position)
+    layout(line_position)
+        Compute the shapes of the map from the positions of the lines.
+    draw(buffer_DC)
         Draw the square map on a device context buffer_DC.
 
     Parameters:
@@ -455,42 +535,42 @@ class SquareMap(object):
     """
 
     def __init__(self):
-        return
+        self._edge_rects = []
+        self._line_segments = []
+        self._dot_rects = []
 
-    def draw(self, buffer_DC, line_position: list):
+    def layout(self, line_position: list):
+        xs = [round(x) for x in line_position[0]]
+        ys = [round(y) for y in line_position[1]]
         edge_length = line_position[0][-1] - line_position[0][0]
 
-        buffer_DC.SetPen(wx.Pen(cp.CLR_BOARD_EDGE))
-        buffer_DC.SetBrush(wx.Brush(cp.CLR_BOARD_EDGE))
-        buffer_DC.DrawRectangle(
-            line_position[0][0] - edge_length*0.05,
-            line_position[1][0] - edge_length*0.05,
-            edge_length*1.1, edge_length*1.1
-            )
-        buffer_DC.SetPen(wx.Pen(cp.CLR_BOARD))
-        buffer_DC.SetBrush(wx.Brush(cp.CLR_BOARD))
-        buffer_DC.DrawRectangle(
-            line_position[0][0] - edge_length*0.025,
-            line_position[1][0] - edge_length*0.025,
-            edge_length*1.05, edge_length*1.05
+        self._edge_rects = [
+            [
+                round(line_position[0][0] - edge_length*margin),
+                round(line_position[1][0] - edge_length*margin),
+                round(edge_length*(1 + 2*margin)),
+                round(edge_length*(1 + 2*margin)),
+                ]
+            for margin in (0.05, 0.025)
+            ]
+        self._line_segments = (
+            [(x, ys[0], x, ys[-1]) for x in xs]
+            + [(xs[0], y, xs[-1], y) for y in ys]
             )
+        radius = max(1, round(edge_length*0.005))
+        self._dot_rects = [
+            (x - radius, y - radius, 2*radius, 2*radius)
+            for x in xs[1:8] for y in ys[1:8]
+            ]
+
+    def draw(self, buffer_DC):
+        for color, rect in zip(
+                (cp.CLR_BOARD_EDGE, cp.CLR_BOARD), self._edge_rects):
+            buffer_DC.SetPen(wx.Pen(color))
+            buffer_DC.SetBrush(wx.Brush(color))
+            buffer_DC.DrawRectangle(*rect)
 
         buffer_DC.SetPen(wx.Pen(cp.CLR_BOARD_LINE))
         buffer_DC.SetBrush(wx.Brush(cp.CLR_BOARD_LINE))
-        for row in range(9):
-            for column in range(9):
-                buffer_DC.DrawLine(
-                    line_position[0][row], line_position[1][0],
-                    line_position[0][row], line_position[1][-1]
-                    )
-                buffer_DC.DrawLine(
-                    line_position[0][0], line_position[1][column],
-                    line_position[0][-1], line_position[1][column]
-                    )
-        for row in range(1, 8):
-            for column in range(1, 8):
-                buffer_DC.DrawCircle(
-                    line_position[0][row],
-                    line_position[1][column],
-                    edge_length*0.005,
-                    )
+        buffer_DC.DrawLineList(self._line_segments)
+        buffer_DC.DrawEllipseList(self._dot_rects)
@@ -108,10 +108,11 @@ class EloRating:
             The number of games member1 won.
         """
         cnt_mbr2_win = number_game - cnt_mbr1_win
-        pre_prblty_1 = self.win_lose_ratio(member1, member2)
+        # Both win-lose ratios sum to 1, so the second one is not calculated.
+        rate_difference = self._rating[member2] - self._rating[member1]
+        pre_prblty_1 = 1.0/(10**(rate_difference*0.0025) + 1)
         expected_win_1 = pre_prblty_1 * number_game
-        pre_prblty_2 = self.win_lose_ratio(member2, member1)
-        expected_win_2 = pre_prblty_2 * number_game
+        expected_win_2 = number_game - expected_win_1
 
         self._rating[member1] = (
             self._rating[member1]
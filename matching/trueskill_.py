@@ -1,5 +1,6 @@
 """Calculate rating."""
 
+import os
 import pickle
 
 import trueskill
@@ -30,6 +31,10 @@ class TrueSkill:
         Save the rating data to the specified file.
     update_rating(rating1, rating2, drawn=False)
         Update the TrueSkill ratings of two members after a match.
+    update_rating_batch(member1, member2, wins, losses, draws)
+        Update the TrueSkill ratings of two members after several matches.
+    update_rating_results(results)
+        Update the TrueSkill ratings with buffered match results.
     initialize_rating()
         Initialize the TrueSkill ratings of all members to the default value.
     printer()
@@ -52,8 +57,11 @@ class TrueSkill:
 
     def save_rating(self):
         """Save the TrueSkill rating data to the specified file."""
-        with open(self._filename, "wb") as file_:
+        # Replace the file only once it is complete.
+        tmp_filename = self._filename + ".tmp"
+        with open(tmp_filename, "wb") as file_:
             pickle.dump(self._rating, file_)
+        os.replace(tmp_filename, self._filename)
 
     def update_rating(
             self, rating1: trueskill.Rating, rating2: trueskill.Rating,
@@ -74,6 +82,53 @@ class TrueSkill:
             self._rating[rating1], self._rating[rating2], drawn = drawn
         )
 
+    def update_rating_batch(
+            self, member1: str, member2: str,
+            wins: int = 0, losses: int = 0, draws: int = 0):
+        """
+        Update the TrueSkill ratings of two members after several matches.
+
+        The result is the same as calling ``update_rating`` once per match,
+        but the ratings are looked up and stored only once.
+
+        Parameters
+        ----------
+        member1, member2 : str
+            The names of the members.
+        wins : int
+            The number of matches member1 won.
+        losses : int
+            The number of matches member1 lost.
+        draws : int
+            The number of drawn matches.
+        """
+        rating1 = self._rating[member1]
+        rating2 = self._rating[member2]
+        rate_1vs1 = trueskill.rate_1vs1
+        for _ in range(wins):
+            rating1, rating2 = rate_1vs1(rating1, rating2)
+        for _ in range(losses):
+            rating2, rating1 = rate_1vs1(rating2, rating1)
+        for _ in range(draws):
+            rating1, rating2 = rate_1vs1(rating1, rating2, drawn=True)
+        self._rating[member1] = rating1
+        self._rating[member2] = rating2
+
+    def update_rating_results(self, results):
+        """
+        Update the TrueSkill ratings with buffered match results.
+
+        TrueSkill updates depend on their order, so the results are applied
+        one by one in the order they arrived.
+
+        Parameters
+        ----------
+        results : iterable of tuple
+            Tuples of (member1, member2, wins, losses, draws).
+        """
+        for result in results:
+            self.update_rating_batch(*result)
+
     def initialize_rating(self):
         """Initialize the ratings of all members."""
         for member in self._rating.keys():
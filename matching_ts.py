@@ -30,17 +30,24 @@ for _ in range(repeat):
 progress_bar = tqdm(total=len(parameters))
 
 
-def set_match(strategy1, strategy2, color):
-    game = OthelloGame(color)
-    game.load_strategy(Strategy)
-    game.change_strategy(strategy1, is_player=True)
-    game.change_strategy(strategy2, is_player=False)
-    game.auto_mode(True)
-    while True:
-        fin, _ = game.process_game()
-        if fin:
-            break
-    return game.result
+# Games reused between matches, keyed by (strategy1, strategy2, color).
+_GAMES = {}
+
+
+def _pooled_game(strategy1, strategy2, color):
+    """Return a game with the given strategies which is ready to be played."""
+    key = (strategy1, strategy2, color)
+    if key not in _GAMES:
+        game = OthelloGame(color)
+        game.load_strategy(Strategy)
+        game.change_strategy(strategy1, is_player=True)
+        game.change_strategy(strategy2, is_player=False)
+        game.auto_mode(True)
+        _GAMES[key] = game
+    else:
+        game = _GAMES[key]
+        game.reset_board()
+    return game
 
 
 def matching(strategies):
@@ -67,49 +74,60 @@ def matching(strategies):
     lose = 0
     drew = 0
 
-    rslt = set_match(strategy1, strategy2, "black")
-    if rslt == "WIN":
-        win += 1
-    if rslt == "LOSE":
-        lose += 1
-    if rslt == "DRAW":
-        drew += 1
-
-    rslt = set_match(strategy1, strategy2, "white")
-    if rslt == "WIN":
-        win += 1
-    if rslt == "LOSE":
-        lose += 1
-    if rslt == "DRAW":
-        drew += 1
+    for color in ["black", "white"]:
+        game = _pooled_game(strategy1, strategy2, color)
+        while True:
+            fin, _ = game.process_game()
+            if fin:
+                break
+
+        if game.result == "WIN":
+            win += 1
+        elif game.result == "LOSE":
+            lose += 1
+        elif game.result == "DRAW":
+            drew += 1
 
     return strategy1, strategy2, win, lose, drew
 
 
-def printer(Rating: TrueSkill):
+def printer(Rating: TrueSkill, bars=None):
+    """Draw the ratings, or update ``bars`` drawn by the previous call.
+
+    Returns
+    ----------
+    bars : matplotlib.container.BarContainer
+        Bars to be passed to the next call.
+    """
     keys, mus, sigmas = Rating.returner()
 
-    plt.bar(list(range(len(mus))), mus, yerr=sigmas)
+    if bars is None:
+        bars = plt.bar(list(range(len(mus))), mus, yerr=sigmas)
+        plt.xticks(list(range(len(mus))), keys)
+    else:
+        for bar, mu in zip(bars, mus):
+            bar.set_height(mu)
+        # Vertical lines of the error bars.
+        bars.errorbar.lines[2][0].set_segments([
+            [(x, mu - sigma), (x, mu + sigma)]
+            for x, (mu, sigma) in enumerate(zip(mus, sigmas))])
     plt.ylim([20, 35])
     # plt.ylim([min(mus)-5, max(mus)+5])
-    plt.xticks(list(range(len(mus))), keys)
+    return bars
 
 
 def runMP(plot=False):
     if plot:
         cnt = 0
         fig = plt.figure()
+        plt.show(block=False)
+        bars = None
 
     with ProcessPoolExecutor(max_workers=8) as executor:
         for rslt in executor.map(matching, parameters):
             # Update Rating.
             strategy1, strategy2, win, lose, drew = rslt
-            for _ in range(win):
-                Rating.update_rating(strategy1, strategy2)
-            for _ in range(lose):
-                Rating.update_rating(strategy2, strategy1)
-            for _ in range(drew):
-                Rating.update_rating(strategy1, strategy2, True)
+            Rating.update_rating_batch(strategy1, strategy2, win, lose, drew)
 
             progress_bar.update(1)
             if plot:
@@ -117,9 +135,9 @@ def runMP(plot=False):
                 if cnt < 10:
                     continue
                 cnt = 0
-                plt.cla()
-                printer(Rating)
-                plt.pause(.01)
+                bars = printer(Rating, bars)
+                fig.canvas.draw_idle()
+                fig.canvas.flush_events()
 
     Rating.save_rating()
     progress_bar.close()
@@ -132,12 +150,7 @@ def runby1():
         rslt = matching(parameter)
         # Update Rating.
         strategy1, strategy2, win, lose, drew = rslt
-        for _ in range(win):
-            Rating.update_rating(strategy1, strategy2)
-        for _ in range(lose):
-            Rating.update_rating(strategy2, strategy1)
-        for _ in range(drew):
-            Rating.update_rating(strategy1, strategy2, True)
+        Rating.update_rating_batch(strategy1, strategy2, win, lose, drew)
         progress_bar.update(1)
 
     Rating.save_rating()
@@ -0,0 +1,186 @@
+"""Compiled bitboard helpers for the strategies."""
+
+import random
+
+from numba import njit
+import numpy as np
+
+_ZERO = np.uint64(0)
+_ONE = np.uint64(1)
+
+# Shift and mask of each direction, in the same order as
+# ``OthelloGameC._check_surround``.
+# 0: upper, 1: upper right, 2: right, 3: lower right,
+# 4: lower, 5: lower left, 6: left, 7: upper left.
+_SHIFTS = np.array([8, 7, 1, 9, 8, 7, 1, 9], dtype=np.uint64)
+_LEFT = np.array([True, True, False, False, False, False, True, True])
+_MASKS = np.array([
+    0xffffffffffffff00, 0x7f7f7f7f7f7f7f00,
+    0x7f7f7f7f7f7f7f7f, 0x007f7f7f7f7f7f7f,
+    0x00ffffffffffffff, 0x00fefefefefefefe,
+    0xfefefefefefefefe, 0xfefefefefefefe00,
+], dtype=np.uint64)
+
+_BYTE = np.uint64(0xff)
+
+
+def _zobrist_table(seed):
+    """
+    Return the Zobrist table of the boards.
+
+    Each square of both boards gets a random 64-bit key.  The keys are
+    folded into one table per byte of a board, so that a board is hashed
+    with 8 lookups instead of one per disk.
+    """
+    rng = random.Random(seed)
+    squares = [[rng.getrandbits(64) for _ in range(64)] for _ in range(2)]
+    table = np.zeros((16, 256), dtype=np.uint64)
+    for side in range(2):
+        for byte in range(8):
+            row = table[8*side + byte]
+            for value in range(1, 256):
+                low = value & -value
+                row[value] = row[value ^ low] ^ np.uint64(
+                    squares[side][8*byte + low.bit_length() - 1])
+    return table
+
+
+# The seed is fixed so that the keys stay valid for saved Q values.
+_ZOBRIST_BOARDS = _zobrist_table(0x0DE770)
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0f0f0f0f0f0f0f0f)
+_H01 = np.uint64(0x0101010101010101)
+
+
+@njit("int64(uint64)", cache=True)
+def popcount(x):
+    """Return the number of set bits of ``x``."""
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return np.int64((x * _H01) >> np.uint64(56))
+
+
+@njit("int8[:](uint64)", cache=True)
+def squares(mask):
+    """Return the indices of the set bits of ``mask`` in ascending order."""
+    result = np.empty(popcount(mask), dtype=np.int8)
+    for i in range(result.size):
+        low = mask & (~mask + _ONE)
+        mask ^= low
+        result[i] = popcount(low - _ONE)
+    return result
+
+
+@njit("uint64(uint64, int64)", cache=True)
+def _surround(x, direction):
+    if _LEFT[direction]:
+        return (x << _SHIFTS[direction]) & _MASKS[direction]
+    return (x >> _SHIFTS[direction]) & _MASKS[direction]
+
+
+@njit("uint64(uint64, uint64, uint64)", cache=True)
+def flips(player, opponent, put):
+    """Return the disks of ``opponent`` reversed by putting on the bit ``put``."""
+    reverse_bit = _ZERO
+    for direction in range(8):
+        reverse_bit_ = _ZERO
+        border_bit = _surround(put, direction)
+        while border_bit & opponent:
+            reverse_bit_ |= border_bit
+            border_bit = _surround(border_bit, direction)
+        # If player's disk is opposite side.
+        if border_bit & player:
+            reverse_bit |= reverse_bit_
+    return reverse_bit
+
+
+@njit("uint64(uint64, uint64, uint64)", cache=True)
+def maximize_moves(player, opponent, moves):
+    """
+    Return the moves which leave the player the most disks.
+
+    Parameters
+    ----------
+    player, opponent : uint64
+        Bitboards of the player to move and of the opponent.
+    moves : uint64
+        Bitboard of the legal moves.
+
+    Returns
+    -------
+    uint64
+        Bitboard of all moves tied for the best result.
+    """
+    best = _ZERO
+    best_merit = np.int64(-1)
+    while moves:
+        put = moves & (~moves + _ONE)
+        moves ^= put
+        merit = popcount(flips(player, opponent, put))
+        if merit > best_merit:
+            best = put
+            best_merit = merit
+        elif merit == best_merit:
+            best |= put
+    return best
+
+
+@njit("uint64(uint64, uint64, uint64)", cache=True)
+def minimize_moves(player, opponent, moves):
+    """
+    Return the moves which leave the player the fewest disks.
+
+    Parameters
+    ----------
+    player, opponent : uint64
+        Bitboards of the player to move and of the opponent.
+    moves : uint64
+        Bitboard of the legal moves.
+
+    Returns
+    -------
+    uint64
+        Bitboard of all moves tied for the best result.
+    """
+    best = _ZERO
+    best_merit = np.int64(65)
+    while moves:
+        put = moves & (~moves + _ONE)
+        moves ^= put
+        merit = popcount(flips(player, opponent, put))
+        if merit < best_merit:
+            best = put
+            best_merit = merit
+        elif merit == best_merit:
+            best |= put
+    return best
+
+
+@njit("uint64(uint64, uint64)", cache=True)
+def zobrist_hash(first, second):
+    """Return the Zobrist key of a pair of bitboards."""
+    key = _ZERO
+    for byte in range(8):
+        shift = np.uint64(8*byte)
+        key ^= _ZOBRIST_BOARDS[byte, (first >> shift) & _BYTE]
+        key ^= _ZOBRIST_BOARDS[8 + byte, (second >> shift) & _BYTE]
+    return key
+
+
+def random_square(mask, rng=random):
+    """
+    Return the index of a set bit of ``mask`` chosen uniformly at random.
+
+    Parameters
+    ----------
+    mask : int
+        A bitboard with at least one set bit.
+    rng : random.Random, optional
+        Random number generator, by default the ``random`` module.
+    """
+    for _ in range(rng.randrange(bin(mask).count("1"))):
+        mask &= mask - 1
+    return (mask & -mask).bit_length() - 1
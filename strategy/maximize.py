@@ -1,6 +1,7 @@
 """A strategy to try to maximize the number of disks you have."""
 
-import random
+from ._bits import maximize_moves, random_square
+from .random import make_rng
 
 
 class Maximize:
@@ -9,7 +10,8 @@ class Maximize:
 
     Attributes
     ----------
-    None
+    _rng : random.Random
+        Random number generator to break ties.
 
     Methods
     -------
@@ -27,22 +29,13 @@ class Maximize:
     int : the index of the chosen move
     """
 
-    def __init__(self):
-        pass
+    __slots__ = ("_rng",)
+
+    def __init__(self, seed=None):
+        self._rng = make_rng(seed)
 
     def put_disk(self, othello):
         turn = othello.turn
-        max_strategy = []
-        max_merit = 0
-
-        candidates = othello.reversible_area_list(turn)
-        for candidate in candidates:
-            new_board = othello.simulate_play(
-                othello.turn, candidate)
-            counter = othello.count_disks(*new_board)
-            if max_merit < counter[turn]:
-                max_strategy = [candidate]
-                max_merit = counter[turn]
-            elif max_merit == counter[turn]:
-                max_strategy.append(candidate)
-        return random.choice(max_strategy)
+        player, opponent = othello.return_player_board(turn)
+        moves = othello.reversible_area(turn)
+        return random_square(maximize_moves(player, opponent, moves), self._rng)
@@ -1,6 +1,7 @@
 """A strategy to try to minimize the number of disks you have."""
 
-import random
+from ._bits import minimize_moves, random_square
+from .random import make_rng
 
 
 class Minimize:
@@ -9,7 +10,8 @@ class Minimize:
 
     Attributes
     ----------
-    None
+    _rng : random.Random
+        Random number generator to break ties.
 
     Methods
     -------
@@ -27,22 +29,13 @@ class Minimize:
     int : the index of the chosen move
     """
 
-    def __init__(self):
-        pass
+    __slots__ = ("_rng",)
+
+    def __init__(self, seed=None):
+        self._rng = make_rng(seed)
 
     def put_disk(self, othello):
         turn = othello.turn
-        min_strategy = []
-        min_merit = float("inf")
-
-        candidates = othello.reversible_area_list(turn)
-        for candidate in candidates:
-            new_board = othello.simulate_play(
-                othello.turn, candidate)
-            counter = othello.count_disks(*new_board)
-            if min_merit > counter[turn]:
-                min_strategy = [candidate]
-                min_merit = counter[turn]
-            elif min_merit == counter[turn]:
-                min_strategy.append(candidate)
-        return random.choice(min_strategy)
+        player, opponent = othello.return_player_board(turn)
+        moves = othello.reversible_area(turn)
+        return random_square(minimize_moves(player, opponent, moves), self._rng)
@@ -1,4 +1,4 @@
-/* Generated by Cython 0.29.33 */
+/* Generated by Cython 3.3.0 */
 
 #ifndef __PYX_HAVE__strategy__minmaxcalc
 #define __PYX_HAVE__strategy__minmaxcalc
@@ -12,7 +12,7 @@ struct MinmaxCObject;
  * cdef public class MinmaxC [object MinmaxCObject, type MinmaxCType]:             # <<<<<<<<<<<<<<
  * 
  *     cdef int _EVAL_TBL1[64]
- */
+*/
 struct MinmaxCObject {
   PyObject_HEAD
   struct __pyx_vtabstruct_8strategy_10minmaxcalc_MinmaxC *__pyx_vtab;
@@ -27,12 +27,17 @@ struct MinmaxCObject {
 
 #ifndef __PYX_HAVE_API__strategy__minmaxcalc
 
-#ifndef __PYX_EXTERN_C
-  #ifdef __cplusplus
-    #define __PYX_EXTERN_C extern "C"
-  #else
-    #define __PYX_EXTERN_C extern
-  #endif
+#ifdef CYTHON_EXTERN_C
+    #undef __PYX_EXTERN_C
+    #define __PYX_EXTERN_C CYTHON_EXTERN_C
+#elif defined(__PYX_EXTERN_C)
+    #ifdef _MSC_VER
+    #pragma message ("Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.")
+    #else
+    #warning Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.
+    #endif
+#else
+    #define __PYX_EXTERN_C extern "C++"
 #endif
 
 #ifndef DL_IMPORT
@@ -46,10 +51,21 @@ __PYX_EXTERN_C DL_IMPORT(PyTypeObject) MinmaxCType;
 /* WARNING: the interface of the module init function changed in CPython 3.5. */
 /* It now returns a PyModuleDef instance instead of a PyModule instance. */
 
-#if PY_MAJOR_VERSION < 3
-PyMODINIT_FUNC initminmaxcalc(void);
-#else
+/* WARNING: Use PyImport_AppendInittab("minmaxcalc", PyInit_minmaxcalc) instead of calling PyInit_minmaxcalc directly from Python 3.5 */
 PyMODINIT_FUNC PyInit_minmaxcalc(void);
+
+#if PY_VERSION_HEX >= 0x03050000 && (defined(__GNUC__) || defined(__clang__) || defined(_MSC_VER) || (defined(__cplusplus) && __cplusplus >= 201402L))
+#if defined(__cplusplus) && __cplusplus >= 201402L
+[[deprecated("Use PyImport_AppendInittab(\"minmaxcalc\", PyInit_minmaxcalc) instead of calling PyInit_minmaxcalc directly.")]] inline
+#elif defined(__GNUC__) || defined(__clang__)
+__attribute__ ((__deprecated__("Use PyImport_AppendInittab(\"minmaxcalc\", PyInit_minmaxcalc) instead of calling PyInit_minmaxcalc directly."), __unused__)) __inline__
+#elif defined(_MSC_VER)
+__declspec(deprecated("Use PyImport_AppendInittab(\"minmaxcalc\", PyInit_minmaxcalc) instead of calling PyInit_minmaxcalc directly.")) __inline
+#endif
+static PyObject* __PYX_WARN_IF_PyInit_minmaxcalc_INIT_CALLED(PyObject* res) {
+  return res;
+}
+#define PyInit_minmaxcalc() __PYX_WARN_IF_PyInit_minmaxcalc_INIT_CALLED(PyInit_minmaxcalc())
 #endif
 
 #endif /* !__PYX_HAVE__strategy__minmaxcalc */
@@ -1,7 +1,154 @@
-from numba import jit
+import contextlib
+from logging import getLogger
+import os
+import pathlib
 import pickle
-import random
+import pickletools
 # import threading
+import zipfile
+
+import numpy as np
+
+from ._bits import flips, zobrist_hash
+from .qtable import QTable
+from .random import make_rng
+
+logger = getLogger(__name__)
+
+# Directory of the files of Q values.
+_DICT_DIR = pathlib.Path("strategy", "QL_dict")
+
+
+def _fast_io_path(path):
+    """Return the msgpack + zstd file name used instead of ``path``."""
+    return path.with_suffix(".msgpack.zst")
+
+
+def _as_table(Q_values):
+    """
+    Return Q values read from a file as a ``QTable``.
+
+    Dictionaries are keyed by (state, action).  The ``(player, opponent)``
+    states of old files are converted to Zobrist keys.
+    """
+    if isinstance(Q_values, QTable):
+        return Q_values
+    if Q_values and isinstance(next(iter(Q_values))[0], tuple):
+        Q_values = {
+            (zobrist_hash(first, second), action): value
+            for ((first, second), action), value in Q_values.items()}
+    return QTable.from_dict(Q_values)
+
+
+def _from_rows(states, masks, vals):
+    """Return a ``QTable`` of an ``.npz`` file holding a row of 64 Q values per state."""
+    bits = (masks[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    rows, actions = np.nonzero(bits)
+    return QTable.from_arrays(states[rows], actions, vals[rows, actions])
+
+
+@contextlib.contextmanager
+def _atomic_write(path):
+    """Open a temporary file which replaces ``path`` once it is written."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        yield f
+    os.replace(tmp_path, path)
+
+
+def load_q_values(path, fast_io=False):
+    """
+    Load Q values written by ``dump_q_values``.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Path of the file.  A ``.npz`` file holds the arrays ``states``,
+        ``actions`` and ``vals``; other files are pickles.  If a ``.npz`` file does not exist,
+        the pickle with the same name is read instead.
+    fast_io : bool, optional
+        Read the msgpack + zstd file next to ``path`` instead.
+        If only ``path`` exists, it is converted once. Defaults to False.
+
+    Returns
+    -------
+    QTable
+        Q values, which are empty if no file exists or the file is broken.
+    """
+    path = pathlib.Path(path)
+    if fast_io:
+        import msgpack
+        import zstandard
+
+        if not _fast_io_path(path).exists():
+            # Migrate the legacy pickle to the new format.
+            Q_values = load_q_values(path)
+            if Q_values:
+                dump_q_values(Q_values, path, fast_io=True)
+            return Q_values
+        with open(_fast_io_path(path), "rb") as f:
+            with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+                return _as_table(msgpack.unpack(
+                    reader, use_list=False, strict_map_key=False))
+
+    # Fresh workers have no file, which is checked without raising.
+    if not path.exists():
+        legacy_path = path.with_suffix(".pickle")
+        if legacy_path != path and legacy_path.exists():
+            return load_q_values(legacy_path)
+        return QTable()
+    try:
+        if path.suffix == ".npz":
+            with np.load(path) as data:
+                if "masks" in data.files:
+                    return _from_rows(data["states"], data["masks"], data["vals"])
+                return QTable.from_arrays(
+                    data["states"], data["actions"], data["vals"])
+        with open(path, "rb", buffering=1 << 20) as f:
+            return _as_table(pickle.load(f))
+    except (pickle.UnpicklingError, EOFError, KeyError, ValueError,
+            zipfile.BadZipFile):
+        logger.warning("Q values in %s are broken and were not loaded.", path)
+        return QTable()
+
+
+def dump_q_values(Q_values, path, fast_io=False):
+    """
+    Write Q values on a file.
+
+    Parameters
+    ----------
+    Q_values : QTable or dict
+        Q values to be written.
+    path : str or os.PathLike
+        Path of the file.  A ``.npz`` file stores the states as uint64, the
+        actions as int8 and the Q values as float32; other files are pickles.
+    fast_io : bool, optional
+        Write msgpack + zstd next to ``path`` instead.
+        Defaults to False.
+    """
+    path = pathlib.Path(path)
+    if fast_io:
+        import msgpack
+        import zstandard
+
+        with _atomic_write(_fast_io_path(path)) as f:
+            with zstandard.ZstdCompressor(level=3).stream_writer(f) as writer:
+                writer.write(msgpack.packb(dict(Q_values.items()), use_bin_type=True))
+        return
+
+    if path.suffix == ".npz":
+        states, actions, vals = _as_table(Q_values).arrays()
+        with _atomic_write(path) as f:
+            # Zobrist keys are random bits, so compression gains nothing.
+            np.savez(f, states=states, actions=actions, vals=vals)
+        return
+
+    # Drop unused memo opcodes so that the file is read faster.
+    data = pickletools.optimize(
+        pickle.dumps(Q_values, protocol=pickle.HIGHEST_PROTOCOL))
+    with _atomic_write(path) as f:
+        f.write(data)
 
 
 class QLearning:
@@ -21,8 +168,8 @@ class QLearning:
 
     Attributes:
     -----------
-    q_table : dict
-        Q-value table.
+    q_table : QTable
+        Q-value table keyed by (state, action).
 
     Methods:
     --------
@@ -32,7 +179,11 @@ class QLearning:
         Update the Q-value table based on the reward received and the next state.
     """
 
-    def __init__(self, alpha=0.5, gamma=0.9, epsilon=0.1, Q_values=None):
+    __slots__ = (
+        "_rng", "_save_path", "_ALPHA", "_GAMMA", "_EPSILON", "_Q_values",
+        "_turn", "_othello", "_possible_actions")
+
+    def __init__(self, alpha=0.5, gamma=0.9, epsilon=0.1, Q_values=None, seed=None):
         """
         Initializes the QLearning object with the given parameters.
 
@@ -44,79 +195,56 @@ class QLearning:
             Discount factor for future rewards.
         epsilon : float, optional (default=0.1)
             Epsilon-greedy policy parameter.
+        Q_values : QTable or dict, optional
+            Q values to be shared, loaded from the file by default.
+        seed : int, optional
+            Seed of the random number generator of the policy.
         """
-        self._save_path = ".//strategy//QL_dict//my_dict-%s-%s-%s.pickle" % (
-            str(alpha), str(gamma), str(epsilon)
-        )
+        self._rng = make_rng(seed)
+        self._save_path = _DICT_DIR / f"my_dict-{alpha}-{gamma}-{epsilon}.npz"
         self._ALPHA = alpha
         self._GAMMA = gamma
         self._EPSILON = epsilon
 
         if Q_values is None:
-            try:
-                with open(self._save_path, "rb") as f:
-                    self._Q_values = pickle.load(f)
-            except:
-                self._Q_values = {}
+            self._Q_values = load_q_values(self._save_path)
         else:
-            self._Q_values = Q_values
-
-        self._EXP2 = (
-            1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192,
-            16384, 32768, 65536, 131072, 262144, 524288, 1048576, 2097152,
-            4194304, 8388608, 16777216, 33554432, 67108864, 134217728,
-            268435456, 536870912, 1073741824, 2147483648, 4294967296,
-            8589934592, 17179869184, 34359738368, 68719476736, 137438953472,
-            274877906944, 549755813888, 1099511627776, 2199023255552,
-            4398046511104, 8796093022208, 17592186044416, 35184372088832,
-            70368744177664, 140737488355328, 281474976710656, 562949953421312,
-            1125899906842624, 2251799813685248, 4503599627370496,
-            9007199254740992, 18014398509481984, 36028797018963968,
-            72057594037927936, 144115188075855872, 288230376151711744,
-            576460752303423488, 1152921504606846976, 2305843009213693952,
-            4611686018427387904, 9223372036854775808,
-        )
+            self._Q_values = _as_table(Q_values)
 
     def save_dict(self):
         """Write dictionary on files."""
-        with open(self._save_path, "wb") as f:
-            pickle.dump(self._Q_values, f)
+        dump_q_values(self._Q_values, self._save_path)
 
     def return_dict(self):
         """Return dictionary on files."""
         return self._Q_values
 
-    def update_q_value(self, state, action, reward, next_state):
+    def update_q_value(self, state, action, reward, next_state, next_moves):
         """
         Updates the Q-value for a given state-action pair using the Q-Learning algorithm.
 
         Parameters:
         -----------
-        state : tuple
-            Current state of the agent.
+        state : int
+            Zobrist key of the current state of the agent.
         action : int
             Action taken by the agent.
         reward : float
             Reward received by the agent.
         next_state : tuple
-            Next state of the agent.
+            Boards of the opponent and of the agent after the action.
+        next_moves : int
+            Bitboard of the legal moves of the opponent in ``next_state``.
         """
-        if self._turn == 0:
-            possible_actions = self._othello.reversible_area_list(
-                self._turn ^ 1, next_state[0], next_state[1])
+        next_key = zobrist_hash(*next_state)
+        if next_moves:
+            max_q_next_state = self._Q_values.max_value(next_key, next_moves)
         else:
-            possible_actions = self._othello.reversible_area_list(
-                self._turn ^ 1, next_state[1], next_state[0])
-
-        if possible_actions != []:
-            max_q_next_state = -1 * max(
-                [self._Q_values.get((next_state, a), 0) for a in possible_actions])
-        else:
-            max_q_next_state = -1 * self._Q_values.get((next_state, action), 0)
-        q_value = self._Q_values.get((state, action), 0)
-        # Q(s, a) = Q(s, a) + α(r + γmaxQ(s', a') - Q(s, a))
-        self._Q_values[(state, action)] = \
-            (1 - self._ALPHA) * q_value + self._ALPHA * (reward + self._GAMMA*max_q_next_state)
+            max_q_next_state = self._Q_values.get(next_key, action)
+        # Q(s, a) = Q(s, a) + α(r - γmaxQ(s', a') - Q(s, a))
+        # The opponent moves in s', so its value is discounted by -γ.
+        self._Q_values.td_update(
+            state, action, reward, max_q_next_state, self._ALPHA, -self._GAMMA)
 
     def select_action(self, state, possible_actions):
         """
@@ -124,27 +252,23 @@ class QLearning:
 
         Parameters
         ----------
-        state : tuple
-            The current state of the environment.
-        possible_actions : List[int]
-            A list of possible actions for the current state.
+        state : int
+            Zobrist key of the current state of the environment.
+        possible_actions : np.ndarray
+            Possible actions for the current state.
 
         Returns
         -------
         int
             The selected action.
         """
-        if random.random() < self._EPSILON:
-            return random.choice(possible_actions)
-        else:
-            q_values = {
-                a: self._Q_values.get((state, a), 0)
-                for a in possible_actions}
-            if all(q == 0 for q in q_values):
-                return random.choice(self._possible_actions)
-            max_q_value = max(q_values.values())
-            return random.choice(
-                [a for a, q in q_values.items() if q == max_q_value])
+        if self._rng.random() < self._EPSILON:
+            return int(possible_actions[self._rng.randrange(possible_actions.size)])
+        # All actions of an unseen state tie at 0.
+        ties = self._Q_values.best_actions(state, possible_actions)
+        if ties.size == 1:
+            return int(ties[0])
+        return int(ties[self._rng.randrange(ties.size)])
 
     def put_disk(self, othello):
         """
@@ -163,35 +287,28 @@ class QLearning:
         self._turn = othello.turn
         self._othello = othello
 
-        self._possible_actions = self._othello.reversible_area_list(self._turn)
+        self._possible_actions = np.array(
+            self._othello.reversible_area_list(self._turn), dtype=np.int8)
 
         # [player, opponent]
-        state = self._othello.return_player_board(self._turn)
+        player, opponent = self._othello.return_player_board(self._turn)
+        state = zobrist_hash(player, opponent)
 
         # Decide next action
         action = self.select_action(state, self._possible_actions)
-        next_state = self._othello.simulate_play(self._turn, action)
-
-        if self._turn == 0:
-            # Judge game.
-            player, opponent = self._othello.count_disks(
-                next_state[0], next_state[1])
-            black = self._othello.reversible_area(
-                0, next_state[0], next_state[1])
-            white = self._othello.reversible_area(
-                1, next_state[0], next_state[1])
-        else:
-            # Judge game.
-            player, opponent = self._othello.count_disks(
-                next_state[1], next_state[0])
-            black = self._othello.reversible_area(
-                0, next_state[1], next_state[0])
-            white = self._othello.reversible_area(
-                1, next_state[1], next_state[0])
+        put = 1 << action
+        reverse_bit = int(flips(player, opponent, put))
+        player ^= put | reverse_bit
+        opponent ^= reverse_bit
+
+        # Judge game.
+        (player_count, opponent_count, player_moves, opponent_moves
+         ) = self._othello.score_and_legal(player, opponent)
 
         reward = 0
-        if (black == 0 and white == 0) or (player+opponent) == 64:
-            reward = player - opponent
+        if (player_count+opponent_count) == 64 or (player_moves == 0 and opponent_moves == 0):
+            reward = player_count - opponent_count
 
-        self.update_q_value(state, action, reward, next_state)
+        self.update_q_value(
+            state, action, reward, (opponent, player), opponent_moves)
         return action
@@ -0,0 +1,352 @@
+"""Hash table of Q values backed by NumPy arrays."""
+
+from numba import njit
+import numpy as np
+
+# State of an empty slot.  Zobrist keys hit it with probability 2**-64.
+EMPTY = np.uint64(0xFFFF_FFFF_FFFF_FFFF)
+
+_ONE = np.uint64(1)
+# Odd multiplier which spreads the actions of a state over the table.
+_MIX = np.uint64(0x9E37_79B9_7F4A_7C15)
+
+
+@njit("int64(uint64[:], int8[:], uint64, int64)", cache=True)
+def _slot(states, actions, state, action):
+    """Return the slot holding the pair, or the empty slot where it belongs."""
+    mask = np.uint64(states.size - 1)
+    # Zobrist keys are uniformly random, so the low bits are a good hash.
+    slot = (state ^ (np.uint64(action) * _MIX)) & mask
+    while states[slot] != EMPTY and (
+            states[slot] != state or actions[slot] != action):
+        slot = (slot + _ONE) & mask
+    return np.int64(slot)
+
+
+@njit("int64(uint64[:], int8[:], uint64, int64)", cache=True)
+def _find(states, actions, state, action):
+    """Return the slot holding the pair, or -1."""
+    slot = _slot(states, actions, state, action)
+    if states[slot] == EMPTY:
+        return -1
+    return slot
+
+
+@njit(
+    "Tuple((int64, float64))(uint64[:], int8[:], float32[:], uint64, int64, float64)",
+    cache=True)
+def _set(states, actions, vals, state, action, value):
+    """
+    Store the Q value of a (state, action) pair.
+
+    Returns whether the pair is new and the change of the sum of all Q values.
+    """
+    slot = _slot(states, actions, state, action)
+    added = 0
+    old = 0.0
+    if states[slot] == EMPTY:
+        states[slot] = state
+        actions[slot] = action
+        added = 1
+    else:
+        old = np.float64(vals[slot])
+    vals[slot] = value
+    return added, np.float64(vals[slot]) - old
+
+
+@njit("float64(float64, float64, float64, float64, float64)", cache=True)
+def td_update(q_value, reward, max_q_next, alpha, gamma):
+    """Return Q(s, a) + α(r + γmaxQ(s', a') - Q(s, a))."""
+    return (1.0 - alpha)*q_value + alpha*(reward + gamma*max_q_next)
+
+
+@njit(
+    "Tuple((int64, float64, float64))"
+    "(uint64[:], int8[:], float32[:], uint64, int64, "
+    "float64, float64, float64, float64)",
+    cache=True)
+def _td_update(states, actions, vals, state, action, reward, max_q_next, alpha, gamma):
+    """Apply ``td_update`` to a stored pair and return ``_set`` and the new value."""
+    slot = _find(states, actions, state, action)
+    q_value = 0.0
+    if slot >= 0:
+        q_value = np.float64(vals[slot])
+    value = td_update(q_value, reward, max_q_next, alpha, gamma)
+    added, delta = _set(states, actions, vals, state, action, value)
+    return added, delta, value
+
+
+@njit("float64(uint64[:], int8[:], float32[:], uint64, uint64)", cache=True)
+def _max_value(states, actions, vals, state, moves):
+    """Return the largest Q value of the actions in the bitboard ``moves``."""
+    best = -np.inf
+    for action in range(64):
+        if (moves >> np.uint64(action)) & _ONE:
+            slot = _find(states, actions, state, action)
+            q_value = 0.0
+            if slot >= 0:
+                q_value = np.float64(vals[slot])
+            best = max(best, q_value)
+    return best
+
+
+@njit("int8[:](uint64[:], int8[:], float32[:], uint64, int8[:])", cache=True)
+def _best_actions(states, actions, vals, state, moves):
+    """Return the actions of ``moves`` whose Q values are the largest, in one pass."""
+    ties = np.empty(moves.size, dtype=np.int8)
+    size = 0
+    best = -np.inf
+    for i in range(moves.size):
+        slot = _find(states, actions, state, moves[i])
+        q_value = 0.0
+        if slot >= 0:
+            q_value = np.float64(vals[slot])
+        if q_value > best:
+            best = q_value
+            size = 0
+        if q_value == best:
+            ties[size] = moves[i]
+            size += 1
+    return ties[:size]
+
+
+@njit(
+    "Tuple((int64, float64))(uint64[:], int8[:], float32[:], uint64[:], int8[:], float32[:])",
+    cache=True)
+def _set_many(states, actions, vals, new_states, new_actions, new_vals):
+    """Store many Q values and return the summed results of ``_set``."""
+    added = 0
+    delta = 0.0
+    for i in range(new_states.size):
+        new, change = _set(
+            states, actions, vals, new_states[i], new_actions[i], np.float64(new_vals[i]))
+        added += new
+        delta += change
+    return added, delta
+
+
+@njit("void(uint64[:], int8[:], float32[:], uint64[:], int8[:], float32[:])", cache=True)
+def _insert(states, actions, vals, new_states, new_actions, new_vals):
+    """Copy pairs which are not stored yet."""
+    for i in range(new_states.size):
+        slot = _slot(states, actions, new_states[i], new_actions[i])
+        states[slot] = new_states[i]
+        actions[slot] = new_actions[i]
+        vals[slot] = new_vals[i]
+
+
+class QTable:
+    """
+    Open addressing hash table from (state, action) pairs to Q values.
+
+    Each slot holds the Zobrist key of a state, an action and its Q value
+    (13 bytes per slot) with linear probing.  States of self-play rarely
+    repeat, so only the pairs which have been stored take memory.  Q values
+    which have not been stored are 0.  The capacity is doubled when the
+    table is half full.
+
+    Parameters
+    ----------
+    capacity_pow2 : int, optional
+        Log2 of the initial number of slots, by default 12.
+
+    Methods
+    -------
+    get(state, action, default=0.0)
+        Return the Q value of an action, or ``default``.
+    max_value(state, moves)
+        Return the largest Q value of the actions in a bitboard.
+    best_actions(state, moves)
+        Return the actions with the largest Q value.
+    set(state, action, value)
+        Store the Q value of an action.
+    set_many(states, actions, values)
+        Store the Q values of arrays of actions.
+    reserve(new_pairs)
+        Grow the table so that more pairs fit without resizing.
+    td_update(state, action, reward, max_q_next, alpha, gamma)
+        Move the Q value of an action towards the temporal difference target.
+    update(other)
+        Store all Q values of another table or dictionary.
+    copy()
+        Return a copy of the table.
+    arrays()
+        Return the states, actions and values of all stored pairs.
+    mean()
+        Return the average of all stored Q values.
+    """
+
+    def __init__(self, capacity_pow2=12):
+        self._allocate(capacity_pow2)
+        self._size = 0
+        self._sum = 0.0
+
+    @classmethod
+    def from_arrays(cls, states, actions, values):
+        """Return a table holding the pairs of ``states`` and ``actions``."""
+        capacity_pow2 = max(12, (2*len(states)).bit_length())
+        table = cls(capacity_pow2)
+        table.set_many(
+            np.asarray(states, dtype=np.uint64),
+            np.asarray(actions, dtype=np.int8),
+            np.asarray(values, dtype=np.float32))
+        return table
+
+    @classmethod
+    def from_dict(cls, Q_values):
+        """Return a table holding a dictionary keyed by (state, action)."""
+        table = cls()
+        table.update(Q_values)
+        return table
+
+    def __reduce__(self):
+        return type(self).from_arrays, self.arrays()
+
+    def __len__(self):
+        """Return the number of stored (state, action) pairs."""
+        return self._size
+
+    def __contains__(self, key):
+        state, action = key
+        return _find(self._states, self._actions, state, action) >= 0
+
+    def get(self, state, action, default=0.0):
+        """Return the Q value of ``action`` in ``state``, or ``default``."""
+        slot = _find(self._states, self._actions, state, action)
+        if slot < 0:
+            return default
+        return float(self._vals[slot])
+
+    def max_value(self, state, moves):
+        """
+        Return the largest Q value of the actions in ``moves``.
+
+        Parameters
+        ----------
+        state : int
+            Zobrist key of the state.
+        moves : int
+            Bitboard of the actions, with at least one set bit.
+        """
+        return _max_value(self._states, self._actions, self._vals, state, moves)
+
+    def best_actions(self, state, moves):
+        """
+        Return the actions of ``moves`` whose Q values are the largest.
+
+        Parameters
+        ----------
+        state : int
+            Zobrist key of the state.
+        moves : np.ndarray of int8
+            Actions to compare, at least one.
+
+        Returns
+        -------
+        np.ndarray of int8
+            The tied actions, all of ``moves`` for an unseen state.
+        """
+        return _best_actions(self._states, self._actions, self._vals, state, moves)
+
+    def set(self, state, action, value):
+        """Store the Q value of ``action`` in ``state``."""
+        self._make_room(1)
+        added, delta = _set(
+            self._states, self._actions, self._vals, state, action, value)
+        self._size += added
+        self._sum += delta
+
+    def set_many(self, states, actions, values):
+        """
+        Store the Q values of arrays of (state, action) pairs in order.
+
+        Parameters
+        ----------
+        states : np.ndarray of uint64
+            Zobrist keys of the states.
+        actions : np.ndarray of int8
+            Actions taken in the states.
+        values : np.ndarray of float32
+            Q values of the pairs.  Later values of a pair win.
+        """
+        self._make_room(states.size)
+        added, delta = _set_many(
+            self._states, self._actions, self._vals, states, actions, values)
+        self._size += added
+        self._sum += delta
+
+    def reserve(self, new_pairs):
+        """Grow the table so that ``new_pairs`` more pairs fit without resizing."""
+        self._make_room(new_pairs)
+
+    def td_update(self, state, action, reward, max_q_next, alpha, gamma):
+        """
+        Update the Q value of ``action`` in ``state`` with one compiled call.
+
+        Returns
+        -------
+        float
+            The new Q value.
+        """
+        self._make_room(1)
+        added, delta, value = _td_update(
+            self._states, self._actions, self._vals, state, action,
+            reward, max_q_next, alpha, gamma)
+        self._size += added
+        self._sum += delta
+        return value
+
+    def items(self):
+        """Return ((state, action), value) of all stored pairs."""
+        states, actions, values = self.arrays()
+        return zip(zip(states.tolist(), actions.tolist()), values.tolist())
+
+    def update(self, other):
+        """Store all Q values of a table or a dictionary keyed by (state, action)."""
+        if isinstance(other, QTable):
+            self.set_many(*other.arrays())
+            return
+        self.set_many(
+            np.fromiter((key[0] for key in other), dtype=np.uint64, count=len(other)),
+            np.fromiter((key[1] for key in other), dtype=np.int8, count=len(other)),
+            np.fromiter(other.values(), dtype=np.float32, count=len(other)))
+
+    def copy(self):
+        """Return a copy of the table."""
+        table = QTable.__new__(QTable)
+        table._states = self._states.copy()
+        table._actions = self._actions.copy()
+        table._vals = self._vals.copy()
+        table._size = self._size
+        table._sum = self._sum
+        return table
+
+    def arrays(self):
+        """Return the states, actions and values of all stored pairs."""
+        used = self._states != EMPTY
+        return self._states[used], self._actions[used], self._vals[used]
+
+    def mean(self):
+        """Return the average of all stored Q values."""
+        if not self._size:
+            return 0.0
+        return self._sum / self._size
+
+    def _allocate(self, capacity_pow2):
+        self._states = np.full(1 << capacity_pow2, EMPTY, dtype=np.uint64)
+        self._actions = np.zeros(1 << capacity_pow2, dtype=np.int8)
+        self._vals = np.zeros(1 << capacity_pow2, dtype=np.float32)
+
+    def _make_room(self, new_pairs):
+        # Grow for the case that all pairs are new.
+        if 2*(self._size + new_pairs) <= self._states.size:
+            return
+        capacity_pow2 = self._states.size.bit_length()
+        while 2*(self._size + new_pairs) > (1 << capacity_pow2):
+            capacity_pow2 += 1
+        self._resize(capacity_pow2)
+
+    def _resize(self, capacity_pow2):
+        states, actions, vals = self.arrays()
+        self._allocate(capacity_pow2)
+        _insert(self._states, self._actions, self._vals, states, actions, vals)
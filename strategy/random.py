@@ -2,13 +2,28 @@
 
 import random
 
+from ._bits import random_square
+
+
+def make_rng(seed=None):
+    """
+    Return the random number generator of a strategy.
+
+    Without a seed the ``random`` module is returned, which Python reseeds
+    in forked worker processes.  A seed gives an independent generator.
+    """
+    if seed is None:
+        return random
+    return random.Random(seed)
+
 
 class Random:
     """A class for randomly putting a disk on the Othello board.
 
     Attributes:
     -----------
-    None
+    _rng : random.Random
+        Random number generator to choose the square.
 
     Methods:
     --------
@@ -26,8 +41,10 @@ class Random:
             The index of the square where the disk is placed.
     """
 
-    def __init__(self):
-        return
+    __slots__ = ("_rng",)
+
+    def __init__(self, seed=None):
+        self._rng = make_rng(seed)
 
     def put_disk(self, othello):
         """Put a disk randomly on the Othello board.
@@ -42,5 +59,4 @@ class Random:
         int
             The index of the square where the disk is placed.
         """
-        candidates = othello.reversible_area_list(othello.turn)
-        return random.choice(candidates)
+        return random_square(othello.reversible_area(othello.turn), self._rng)
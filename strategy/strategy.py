@@ -6,6 +6,24 @@ from .minmaxcalc import MinmaxC
 from .qlearning import QLearning
 from .random import Random
 
+# Factories of the strategies, keyed by name.
+_FACTORIES = {
+    "random": Random,
+    "maximize": Maximize,
+    "minimize": Minimize,
+    "min-max short": lambda: MinmaxC(2),
+    "min-max": lambda: MinmaxC(4),
+    "min-max long": lambda: MinmaxC(6),
+    "QLearning": QLearning,
+}
+
+# Strategies without state are shared by all players.
+_SINGLETONS = {
+    "random": Random(),
+    "maximize": Maximize(),
+    "minimize": Minimize(),
+}
+
 
 class Strategy:
     """
@@ -28,6 +46,8 @@ class Strategy:
         Chooses a position to put a disk on the board using the current strategy.
     """
 
+    __slots__ = ("_strategy",)
+
     def __init__(self, othello, strategy: str = "random"):
         """
         Initializes an instance of the Strategy class.
@@ -49,23 +69,13 @@ class Strategy:
         -----------
         strategy : str
             The name of the strategy to use.
+        **kwargs
+            Arguments of the strategy, such as ``seed``.
         """
-        if strategy == "random":
-            self._strategy = Random()
-        elif strategy == "maximize":
-            self._strategy = Maximize()
-        elif strategy == "minimize":
-            self._strategy = Minimize()
-        elif strategy == "min-max short":
-            self._strategy = MinmaxC(2)
-        elif strategy == "min-max":
-            self._strategy = MinmaxC(4)
-        elif strategy == "min-max long":
-            self._strategy = MinmaxC(6)
-        elif strategy == "QLearning":
-            self._strategy = QLearning(**kwargs)
+        if strategy in _SINGLETONS and not kwargs:
+            self._strategy = _SINGLETONS[strategy]
         else:
-            raise KeyError
+            self._strategy = _FACTORIES[strategy](**kwargs)
 
     def selecter(self, othello):
         """